@@ -7,7 +7,7 @@
 // Features vs original PS script:
 // - Single instance (mutex) + optional CLI signals (toggle/exit)
 // - Robust hotkey parsing & (un)register
-// - Optional low-level mouse hook, suspended in fullscreen
+// - Optional raw mouse input (no global hook), suspended in fullscreen
 // - Two ways to detect desktop listview: by cursor hit-test + fallback enumeration (Progman/WorkerW → SHELLDLL_DefView → SysListView32)
 // - Per-monitor DPI aware (PMv2)
 // - Config in %APPDATA%\a6.DesktopIconToggleLite\config.json
@@ -19,13 +19,12 @@ using System.Diagnostics;
 using System.Drawing;
 using System.IO;
 using System.Runtime.InteropServices;
-using System.Text;
 using System.Text.Json;
 using System.Text.Json.Serialization;
 using System.Windows.Forms;
 using Microsoft.Win32;
 
-internal static class App
+internal static partial class App
 {
     public const string AppName = "Desktop Icon Toggle Lite";
     public const string AppId   = "a6.DesktopIconToggleLite";
@@ -39,6 +38,8 @@ internal static class App
     private const string MutexName = "Global\\a6.DesktopIconToggleLite";
 
     // Registered message for cross-instance signaling
+    private const string MsgToggleName = "A6_DITL_TOGGLE";
+    private const string MsgExitName   = "A6_DITL_EXIT";
     private static uint _uMsgToggle;
     private static uint _uMsgExit;
 
@@ -55,19 +56,19 @@ internal static class App
             // second instance: try to signal toggle/exit if requested
             if (args.Length > 0)
             {
-                _uMsgToggle = RegisterWindowMessage("A6_DITL_TOGGLE");
-                _uMsgExit   = RegisterWindowMessage("A6_DITL_EXIT");
+                _uMsgToggle = RegisterWindowMessage(MsgToggleName);
+                _uMsgExit   = RegisterWindowMessage(MsgExitName);
 
-                IntPtr h = FindWindow(null, HiddenForm.WindowTitle);
+                IntPtr h = Native.FindWindow(null, HiddenForm.WindowTitle);
                 if (h != IntPtr.Zero)
                 {
                     if (string.Equals(args[0], "toggle", StringComparison.OrdinalIgnoreCase))
                     {
-                        SendMessage(h, _uMsgToggle, IntPtr.Zero, IntPtr.Zero);
+                        Native.SendMessage(h, (int)_uMsgToggle, IntPtr.Zero, IntPtr.Zero);
                     }
                     else if (string.Equals(args[0], "exit", StringComparison.OrdinalIgnoreCase))
                     {
-                        SendMessage(h, _uMsgExit, IntPtr.Zero, IntPtr.Zero);
+                        Native.SendMessage(h, (int)_uMsgExit, IntPtr.Zero, IntPtr.Zero);
                     }
                 }
             }
@@ -80,8 +81,8 @@ internal static class App
         // Save defaults on first run
         if (!File.Exists(ConfigPath)) Cfg.Save(ConfigPath);
 
-        _uMsgToggle = RegisterWindowMessage("A6_DITL_TOGGLE");
-        _uMsgExit   = RegisterWindowMessage("A6_DITL_EXIT");
+        _uMsgToggle = RegisterWindowMessage(MsgToggleName);
+        _uMsgExit   = RegisterWindowMessage(MsgExitName);
 
         using var ctx = new TrayContext(_uMsgToggle, _uMsgExit);
         Application.Run(ctx);
@@ -91,24 +92,47 @@ internal static class App
     }
 
     // ---------- Config ----------
-    internal sealed class Config
+    internal sealed class Config : IJsonOnDeserialized
     {
-        [JsonConverter(typeof(JsonStringEnumConverter))]
+        private const string DefaultHotkey = "Ctrl+Alt+F1";
+
+        [JsonConverter(typeof(JsonStringEnumConverter<RunMode>))]
         public RunMode Mode { get; set; } = RunMode.Hotkey; // Hotkey or DesktopDoubleClick
-        public string Hotkey { get; set; } = "Ctrl+Alt+F1";
+        public string Hotkey { get; set; } = DefaultHotkey;
         public bool   SuppressInFullscreen { get; set; } = true;
         public bool   ShowTrayIcon { get; set; } = true;
         public bool   AutoStart    { get; set; } = false;
 
+        // Bytes last known to be on disk (BOM stripped); Save is a no-op while they match. Seeded from
+        // the file as read, so a hand-edited file fixed up by OnDeserialized is rewritten on next Save.
+        private byte[]? _savedUtf8;
+
+        // Runs inside the generated deserializer: hand-edited values are fixed up during decode,
+        // not in a separate pass (numeric Mode values, "Hotkey": null / "").
+        void IJsonOnDeserialized.OnDeserialized()
+        {
+            if (!Enum.IsDefined(Mode)) Mode = RunMode.Hotkey;
+            if (string.IsNullOrWhiteSpace(Hotkey)) Hotkey = DefaultHotkey;
+        }
+
+        // Notepad may save with a BOM, which the UTF-8 reader does not accept.
+        private static ReadOnlySpan<byte> Utf8Bom => new byte[] { 0xEF, 0xBB, 0xBF };
+
+        // One read into a contiguous buffer, parsed as UTF-8 without a UTF-16 decode pass.
         public static Config Load(string path)
         {
             try
             {
                 if (File.Exists(path))
                 {
-                    var json = File.ReadAllText(path);
-                    var cfg = JsonSerializer.Deserialize<Config>(json, JsonOptions());
-                    if (cfg != null) return cfg;
+                    ReadOnlySpan<byte> utf8 = File.ReadAllBytes(path);
+                    if (utf8.StartsWith(Utf8Bom)) utf8 = utf8[Utf8Bom.Length..];
+                    var cfg = JsonSerializer.Deserialize(utf8, ConfigJsonContext.Default.Config);
+                    if (cfg != null)
+                    {
+                        cfg._savedUtf8 = utf8.ToArray();
+                        return cfg;
+                    }
                 }
             }
             catch { /* ignore */ }
@@ -117,17 +141,22 @@ internal static class App
 
         public void Save(string path)
         {
-            var json = JsonSerializer.Serialize(this, JsonOptions());
-            File.WriteAllText(path, json, new UTF8Encoding(encoderShouldEmitUTF8Identifier: false));
+            var utf8 = JsonSerializer.SerializeToUtf8Bytes(this, ConfigJsonContext.Default.Config);
+            if (_savedUtf8 != null && utf8.AsSpan().SequenceEqual(_savedUtf8) && File.Exists(path)) return;
+            File.WriteAllBytes(path, utf8);
+            _savedUtf8 = utf8;
         }
+    }
 
-        private static JsonSerializerOptions JsonOptions() => new()
-        {
-            WriteIndented = true,
-            AllowTrailingCommas = true,
-            ReadCommentHandling = JsonCommentHandling.Skip,
-            PropertyNameCaseInsensitive = true
-        };
+    // Source-generated (de)serializer: no per-call options or reflection metadata.
+    [JsonSourceGenerationOptions(
+        WriteIndented = true,
+        AllowTrailingCommas = true,
+        ReadCommentHandling = JsonCommentHandling.Skip,
+        PropertyNameCaseInsensitive = true)]
+    [JsonSerializable(typeof(Config))]
+    internal sealed partial class ConfigJsonContext : JsonSerializerContext
+    {
     }
 
     internal enum RunMode
@@ -149,13 +178,34 @@ internal static class App
         private readonly ToolStripMenuItem _miOpenConfig;
 
         private readonly HiddenForm _wnd; // message sink + hotkey window
-        private readonly Timer _hookTimer;
-        private IntPtr _mouseHook = IntPtr.Zero;
-        private Native.LowLevelMouseProc? _mouseProc;
+        private readonly IntPtr _wndHandle;
+        private readonly System.Windows.Forms.Timer _mouseTimer;
+        private RawMouseSink? _rawMouse; // created on first use; hotkey mode never starts the thread
+
+        private const int ToggleDebounceMs = 150;
+        private long _lastToggleTick = -ToggleDebounceMs;
 
-        private DateTime _lastClick = DateTime.MinValue;
-        private IntPtr   _lastHwnd  = IntPtr.Zero;
+        private bool _hasLastClick;
+        private int  _lastClickTick;
         private Native.POINT _lastPt;
+        // system double-click metrics, re-read on WM_SETTINGCHANGE rather than per click
+        private int  _dblTime = SystemInformation.DoubleClickTime;
+        private Size _dblSize = SystemInformation.DoubleClickSize;
+
+        // Desktop SysListView32 + its screen rect, so raw clicks outside the desktop
+        // are rejected without any cross-process calls.
+        private IntPtr _desktopLv = IntPtr.Zero;
+        private Native.RECT _desktopLvRect;
+        private bool _desktopLvValid;
+
+        // Class atoms of the desktop windows (0 = unknown), learned from handles found by
+        // class name so hit-tests compare integers instead of class-name strings.
+        private ushort _atomProgman;
+        private ushort _atomWorkerW;
+        private ushort _atomListView;
+
+        // Progman lives as long as the Explorer session; validated with IsWindow before reuse.
+        private IntPtr _progman = IntPtr.Zero;
 
         private readonly uint _msgToggle;
         private readonly uint _msgExit;
@@ -167,14 +217,17 @@ internal static class App
 
             // message sink window
             _wnd = new HiddenForm(_msgToggle, _msgExit);
-            _wnd.ToggleRequested += (_, _) => ToggleDesktopIcons();
+            _wnd.ToggleRequested += (_, _) => RequestToggle();
             _wnd.ExitRequested   += (_, _) => ExitApp();
+            _wnd.RawClick += (_, click) => OnRawClick(click);
+            _wnd.ShellChanged += (_, _) => { InvalidateDesktopListView(); ReadDoubleClickMetrics(); };
+            _wndHandle = _wnd.Handle;
 
             // tray menu
             _menu = new ContextMenuStrip();
-            _miToggle = new ToolStripMenuItem("立即切换图标", null, (_, __) => ToggleDesktopIcons());
-            _miModeHotkey = new ToolStripMenuItem("模式：热键（推荐）", null, (_, __) => { App.Cfg.Mode = RunMode.Hotkey; PersistAndRefresh(); });
-            _miModeDbl    = new ToolStripMenuItem("模式：桌面空白处双击", null, (_, __) => { App.Cfg.Mode = RunMode.DesktopDoubleClick; PersistAndRefresh(); });
+            _miToggle = new ToolStripMenuItem("立即切换图标", null, (_, __) => RequestToggle());
+            _miModeHotkey = new ToolStripMenuItem("模式：热键（推荐）", null, (_, __) => SetMode(RunMode.Hotkey));
+            _miModeDbl    = new ToolStripMenuItem("模式：桌面空白处双击", null, (_, __) => SetMode(RunMode.DesktopDoubleClick));
             _miAutoStart  = new ToolStripMenuItem("开机自启", null, (_, __) => { ToggleAutoStart(); });
             _miOpenConfig = new ToolStripMenuItem("打开配置文件", null, (_, __) => OpenConfig());
             _miExit       = new ToolStripMenuItem("退出", null, (_, __) => ExitApp());
@@ -191,6 +244,8 @@ internal static class App
                 new ToolStripSeparator(),
                 _miExit
             });
+            // items are built once; only the check marks are refreshed, right before showing
+            _menu.Opening += (_, _) => RefreshMenuChecks();
 
             _tray = new NotifyIcon
             {
@@ -201,26 +256,32 @@ internal static class App
             };
             _tray.MouseClick += (_, e) =>
             {
-                if (e.Button == MouseButtons.Left) ToggleDesktopIcons();
+                if (e.Button == MouseButtons.Left) RequestToggle();
             };
 
             // hotkey
             RegisterHotkeyOrWarn();
 
-            // mouse hook timer (start/stop based on mode + fullscreen)
-            _hookTimer = new Timer { Interval = 1200 };
-            _hookTimer.Tick += (_, __) => UpdateMouseHookState();
-            _hookTimer.Start();
+            // raw mouse input (start/stop based on mode + fullscreen)
+            _mouseTimer = new System.Windows.Forms.Timer { Interval = 1200 };
+            _mouseTimer.Tick += (_, __) => UpdateRawMouseState();
+            _mouseTimer.Start();
 
-            RefreshMenuChecks();
             EnsureAutoStartState();
         }
 
+        // Re-selecting the checked mode is a no-op: no config serialization, no raw input re-evaluation.
+        private void SetMode(RunMode mode)
+        {
+            if (App.Cfg.Mode == mode) return;
+            App.Cfg.Mode = mode;
+            PersistAndRefresh();
+        }
+
         private void PersistAndRefresh()
         {
             try { App.Cfg.Save(App.ConfigPath); } catch { /* ignore */ }
-            RefreshMenuChecks();
-            UpdateMouseHookState();
+            UpdateRawMouseState();
         }
 
         private void RefreshMenuChecks()
@@ -234,30 +295,51 @@ internal static class App
         {
             try
             {
-                if (IsAutoStartEnabled()) DisableAutoStart();
-                else EnableAutoStart();
+                bool enable = !IsAutoStartEnabled();
+                if (enable) EnableAutoStart();
+                else DisableAutoStart();
+                // menu wins over config: record the new state
+                App.Cfg.AutoStart = enable;
             }
             catch (Exception ex)
             {
                 MessageBox.Show($"自启动配置失败：{ex.Message}", AppName, MessageBoxButtons.OK, MessageBoxIcon.Warning);
+                return;
+            }
+            // the registry change already stuck; a config write failure is not an autostart failure
+            try { App.Cfg.Save(App.ConfigPath); } catch { /* ignore */ }
+        }
+
+        // Config asks for autostart but the Run entry is missing (e.g. first run, cleaned registry).
+        private void EnsureAutoStartState()
+        {
+            try
+            {
+                if (App.Cfg.AutoStart && !IsAutoStartEnabled()) EnableAutoStart();
             }
-            RefreshMenuChecks();
+            catch { /* ignore */ }
         }
 
         private static string RunRegPath => @"Software\Microsoft\Windows\CurrentVersion\Run";
         private static string RunRegName => AppId;
         private static string ExePath => Application.ExecutablePath;
+        // built once; the exe path does not change while we run
+        private static readonly string RunCommand = $"\"{ExePath}\"";
 
-        private static bool IsAutoStartEnabled()
+        // HKCU\...\Run, opened read-only on first query and kept until exit. Writes open their own
+        // writable handle, so a Run key locked against writing never breaks the menu's query.
+        private RegistryKey? _runKey;
+
+        private bool IsAutoStartEnabled()
         {
-            using var rk = Registry.CurrentUser.OpenSubKey(RunRegPath, false);
-            var val = rk?.GetValue(RunRegName) as string;
+            _runKey ??= Registry.CurrentUser.OpenSubKey(RunRegPath, false);
+            var val = _runKey?.GetValue(RunRegName) as string;
             return !string.IsNullOrEmpty(val);
         }
         private static void EnableAutoStart()
         {
-            using var rk = Registry.CurrentUser.OpenSubKey(RunRegPath, true) ?? Registry.CurrentUser.CreateSubKey(RunRegPath, true);
-            rk.SetValue(RunRegName, $"\"{ExePath}\"");
+            using var rk = Registry.CurrentUser.CreateSubKey(RunRegPath, true);
+            rk.SetValue(RunRegName, RunCommand);
         }
         private static void DisableAutoStart()
         {
@@ -287,76 +369,100 @@ internal static class App
             }
             else
             {
-                _wnd.HotkeyPressed += (_, __) => ToggleDesktopIcons();
+                _wnd.HotkeyPressed += (_, __) => RequestToggle();
+            }
+        }
+
+        private void UpdateRawMouseState()
+        {
+            bool wantInput = App.Cfg.Mode == RunMode.DesktopDoubleClick;
+            if (App.Cfg.SuppressInFullscreen && IsFullscreenForeground()) wantInput = false;
+
+            if (wantInput) EnsureDesktopListView();
+
+            if (wantInput && _rawMouse == null)
+            {
+                try { _rawMouse = new RawMouseSink(_wndHandle); }
+                catch { return; } // retried next tick
             }
+
+            // keyed on the registration result, not the request: a failed registration is retried next tick
+            if (wantInput && !_rawMouse!.Registered) _rawMouse.Start();
+            else if (!wantInput && _rawMouse is { Active: true }) _rawMouse.Stop();
         }
 
-        private void UpdateMouseHookState()
+        // Runs for every primary-button press reported by the raw input thread.
+        // Keep it cheap: clicks off the desktop rect are rejected without cross-process calls.
+        private void OnRawClick(RawClickInfo click)
         {
-            bool wantHook = App.Cfg.Mode == RunMode.DesktopDoubleClick;
-            if (App.Cfg.SuppressInFullscreen && Native.IsFullscreenForeground()) wantHook = false;
+            var ptNow = click.Pt;
+            if (_desktopLvValid && !_desktopLvRect.Contains(ptNow)) return;
 
-            if (wantHook && _mouseHook == IntPtr.Zero)
+            bool withinTime = _hasLastClick && unchecked(click.Tick - _lastClickTick) <= _dblTime;
+            int dx = Math.Abs(ptNow.X - _lastPt.X);
+            int dy = Math.Abs(ptNow.Y - _lastPt.Y);
+            bool withinDist = dx <= _dblSize.Width && dy <= _dblSize.Height;
+
+            if (withinTime && withinDist)
             {
-                _mouseProc = MouseProc;
-                _mouseHook = Native.SetWindowsHookEx(Native.WH_MOUSE_LL, _mouseProc!, IntPtr.Zero, 0);
+                _hasLastClick = false;
+                OnDoubleClickCandidate(ptNow);
             }
-            else if (!wantHook && _mouseHook != IntPtr.Zero)
+            else
             {
-                Native.UnhookWindowsHookEx(_mouseHook);
-                _mouseHook = IntPtr.Zero;
+                _hasLastClick = true;
+                _lastClickTick = click.Tick;
+                _lastPt = ptNow;
             }
         }
 
-        private IntPtr MouseProc(int nCode, IntPtr wParam, IntPtr lParam)
+        private void ReadDoubleClickMetrics()
         {
-            if (nCode >= 0 && wParam == (IntPtr)Native.WM_LBUTTONDOWN)
-            {
-                var now = DateTime.UtcNow;
-                int dblTime = SystemInformation.DoubleClickTime;
-                var dblSize = SystemInformation.DoubleClickSize;
+            _dblTime = SystemInformation.DoubleClickTime;
+            _dblSize = SystemInformation.DoubleClickSize;
+        }
 
-                Native.POINT ptNow;
-                Native.GetCursorPos(out ptNow);
-                IntPtr hwndNow = Native.WindowFromPoint(ptNow);
+        // Reuse the cached handle while it is alive; Explorer may die before TaskbarCreated arrives.
+        private void EnsureDesktopListView()
+        {
+            if (!_desktopLvValid || !Native.IsWindow(_desktopLv)) RefreshDesktopListView();
+        }
 
-                bool withinTime = (now - _lastClick).TotalMilliseconds <= dblTime;
-                int dx = Math.Abs(ptNow.X - _lastPt.X);
-                int dy = Math.Abs(ptNow.Y - _lastPt.Y);
-                bool withinDist = dx <= dblSize.Width && dy <= dblSize.Height;
-                bool sameHwnd = hwndNow == _lastHwnd;
+        private void RefreshDesktopListView()
+        {
+            _desktopLv = GetDesktopListViewEnumerate();
+            _desktopLvValid = _desktopLv != IntPtr.Zero && Native.GetWindowRect(_desktopLv, out _desktopLvRect);
 
-                if (withinTime && withinDist && sameHwnd)
-                {
-                    if (TestDesktopBlankHit())
-                    {
-                        try { ToggleDesktopIcons(); } catch { /* ignore */ }
-                    }
-                    _lastClick = DateTime.MinValue;
-                    _lastHwnd = IntPtr.Zero;
-                }
-                else
-                {
-                    _lastClick = now;
-                    _lastHwnd = hwndNow;
-                    _lastPt = ptNow;
-                }
-            }
-            return Native.CallNextHookEx(_mouseHook, nCode, wParam, lParam);
+            _atomListView = Native.GetClassWord(_desktopLv, Native.GCW_ATOM);
+            _progman      = Native.FindWindow("Progman", null); // shared with ToggleDesktopIcons
+            _atomProgman  = Native.GetClassWord(_progman, Native.GCW_ATOM);
+            _atomWorkerW  = Native.GetClassWord(Native.FindWindowEx(IntPtr.Zero, IntPtr.Zero, "WorkerW", null), Native.GCW_ATOM);
+        }
+
+        // WM_SETTINGCHANGE / WM_DISPLAYCHANGE / TaskbarCreated (Explorer restart)
+        private void InvalidateDesktopListView()
+        {
+            _desktopLv = IntPtr.Zero;
+            _desktopLvValid = false;
+            _progman = IntPtr.Zero;
+            _atomProgman = _atomWorkerW = _atomListView = 0; // classes are re-registered when Explorer restarts
         }
 
-        private static bool TestDesktopBlankHit()
+        private void OnDoubleClickCandidate(Native.POINT ptScreen)
         {
-            IntPtr lv = GetDesktopListViewFromCursor();
-            if (lv == IntPtr.Zero)
+            EnsureDesktopListView();
+
+            if (TestDesktopBlankHit(ptScreen))
             {
-                // fallback to enumeration (Progman/WorkerW → SHELLDLL_DefView → SysListView32)
-                lv = GetDesktopListViewEnumerate();
-                if (lv == IntPtr.Zero) return false;
+                try { RequestToggle(); } catch { /* ignore */ }
             }
+        }
+
+        private bool TestDesktopBlankHit(Native.POINT ptScreen)
+        {
+            IntPtr lv = GetDesktopListViewFromPoint(ptScreen);
+            if (lv == IntPtr.Zero) return false;
 
-            Native.POINT ptScreen;
-            Native.GetCursorPos(out ptScreen);
             var ptClient = ptScreen;
             Native.ScreenToClient(lv, ref ptClient);
 
@@ -372,19 +478,30 @@ internal static class App
             return hti.iItem < 0;
         }
 
-        private static IntPtr GetDesktopListViewFromCursor()
+        // One GetAncestor(GA_ROOT) instead of walking GetParent: the point is on the desktop
+        // only if its top-level window is Progman/WorkerW.
+        private IntPtr GetDesktopListViewFromPoint(Native.POINT pt)
         {
-            Native.POINT pt;
-            Native.GetCursorPos(out pt);
             IntPtr h = Native.WindowFromPoint(pt);
-            IntPtr cur = h;
-            for (int i = 0; i < 10 && cur != IntPtr.Zero; i++)
-            {
-                var cls = GetClassName(cur);
-                if (cls == "SysListView32") return cur;
-                cur = Native.GetParent(cur);
-            }
-            return IntPtr.Zero;
+            if (h == IntPtr.Zero) return IntPtr.Zero;
+            if (h == _desktopLv) return h;
+
+            IntPtr root = Native.GetAncestor(h, Native.GA_ROOT);
+            if (!IsClass(root, ref _atomProgman, "Progman") && !IsClass(root, ref _atomWorkerW, "WorkerW"))
+                return IntPtr.Zero; // another window covers the point
+
+            // fallback to the cached enumeration result (Progman/WorkerW → SHELLDLL_DefView → SysListView32)
+            return IsClass(h, ref _atomListView, "SysListView32") ? h : _desktopLv;
+        }
+
+        // Atom compare once known; until then compare the class name in place and learn
+        // the atom from the first matching window.
+        private static bool IsClass(IntPtr h, ref ushort atom, string name)
+        {
+            if (atom != 0) return Native.GetClassWord(h, Native.GCW_ATOM) == atom;
+            if (!ClassNameEquals(h, name)) return false;
+            atom = Native.GetClassWord(h, Native.GCW_ATOM);
+            return true;
         }
 
         private static IntPtr GetDesktopListViewEnumerate()
@@ -405,39 +522,50 @@ internal static class App
             return lv;
         }
 
-        private static string GetClassName(IntPtr h)
+        // Compares the WCHAR buffer directly; no managed string is materialized.
+        private static unsafe bool ClassNameEquals(IntPtr h, string name)
+        {
+            char* buf = stackalloc char[256];
+            int n = Native.GetClassName(h, buf, 256);
+            return new ReadOnlySpan<char>(buf, n).SequenceEqual(name.AsSpan());
+        }
+
+        // Every toggle source (hotkey, tray, menu, double-click, CLI) funnels through here;
+        // requests arriving within the debounce window are dropped so Explorer sees one command.
+        private void RequestToggle()
         {
-            var sb = new StringBuilder(256);
-            Native.GetClassName(h, sb, sb.Capacity);
-            return sb.ToString();
+            long now = Environment.TickCount64;
+            if (now - _lastToggleTick < ToggleDebounceMs) return;
+            _lastToggleTick = now;
+            ToggleDesktopIcons();
         }
 
-        private static void ToggleDesktopIcons()
+        private void ToggleDesktopIcons()
         {
-            // Primary approach: send WM_COMMAND 0x7402 to Progman (Explorer processes it)
-            IntPtr prog = Native.FindWindow("Progman", null);
+            // Primary approach: post WM_COMMAND 0x7402 to Progman (Explorer processes it).
+            // Posted, not sent, so a busy Explorer never stalls our message loop.
+            if (_progman == IntPtr.Zero || !Native.IsWindow(_progman))
+                _progman = Native.FindWindow("Progman", null);
+            IntPtr prog = _progman;
             if (prog != IntPtr.Zero)
             {
-                Native.SendMessage(prog, Native.WM_COMMAND, (IntPtr)0x7402, IntPtr.Zero);
+                Native.PostMessage(prog, Native.WM_COMMAND, (IntPtr)0x7402, IntPtr.Zero);
                 return;
             }
-            // Fallback: send to SHELLDLL_DefView parent
+            // Fallback: post to SHELLDLL_DefView parent
             IntPtr defView = Native.FindWindowEx(Native.FindWindow("Progman", null), IntPtr.Zero, "SHELLDLL_DefView", null);
             if (defView != IntPtr.Zero)
             {
                 IntPtr parent = Native.GetParent(defView);
                 if (parent != IntPtr.Zero)
-                    Native.SendMessage(parent, Native.WM_COMMAND, (IntPtr)0x7402, IntPtr.Zero);
+                    Native.PostMessage(parent, Native.WM_COMMAND, (IntPtr)0x7402, IntPtr.Zero);
             }
         }
 
         private void ExitApp()
         {
-            try
-            {
-                if (_mouseHook != IntPtr.Zero) Native.UnhookWindowsHookEx(_mouseHook);
-            }
-            catch { }
+            try { _mouseTimer.Stop(); _rawMouse?.Dispose(); } catch { }
+            try { _runKey?.Dispose(); } catch { }
             try { _tray.Visible = false; _tray.Dispose(); } catch { }
             try { _wnd.Dispose(); } catch { }
             Application.ExitThread();
@@ -453,13 +581,17 @@ internal static class App
     private sealed class HiddenForm : Form
     {
         public const string WindowTitle = "A6.DesktopIconToggleLite";
+        public const int WM_APP_RAWCLICK = Native.WM_APP + 1; // wParam = tick, lParam = MAKELPARAM(x, y) (screen)
         public event EventHandler? HotkeyPressed;
         public event EventHandler? ToggleRequested;
         public event EventHandler? ExitRequested;
+        public event EventHandler<RawClickInfo>? RawClick;
+        public event EventHandler? ShellChanged;
 
         private int _hotId = 1;
         private readonly uint _msgToggle;
         private readonly uint _msgExit;
+        private readonly uint _msgTaskbarCreated = RegisterWindowMessage("TaskbarCreated");
 
         public HiddenForm(uint msgToggle, uint msgExit)
         {
@@ -483,9 +615,10 @@ internal static class App
         {
             try
             {
-                ParseHotkey(hk, out int mod, out int vk);
+                var key = ParseHotkey(hk);
                 Native.UnregisterHotKey(Handle, _hotId);
-                if (!Native.RegisterHotKey(Handle, _hotId, mod, vk))
+                // MOD_NOREPEAT: holding the combo produces one WM_HOTKEY, not an auto-repeat stream
+                if (!Native.RegisterHotKey(Handle, _hotId, key.Modifiers | Native.MOD_NOREPEAT, key.Vk))
                     return false;
                 return true;
             }
@@ -506,6 +639,16 @@ internal static class App
             {
                 ExitRequested?.Invoke(this, EventArgs.Empty);
             }
+            else if (m.Msg == WM_APP_RAWCLICK)
+            {
+                int xy = m.LParam.ToInt32();
+                var pt = new Native.POINT { X = (short)(xy & 0xFFFF), Y = (short)(xy >> 16) };
+                RawClick?.Invoke(this, new RawClickInfo(pt, m.WParam.ToInt32()));
+            }
+            else if (m.Msg == Native.WM_SETTINGCHANGE || m.Msg == Native.WM_DISPLAYCHANGE || m.Msg == _msgTaskbarCreated)
+            {
+                ShellChanged?.Invoke(this, EventArgs.Empty);
+            }
             base.WndProc(ref m);
         }
 
@@ -515,58 +658,287 @@ internal static class App
             base.Dispose(disposing);
         }
 
+        // Immutable (modifier mask, virtual key) pair; cheap to cache and compare.
+        private readonly record struct Hotkey(int Modifiers, int Vk);
+
+        // token → hotkey part; modifiers have Vk = 0, main keys Modifiers = 0
+        private static readonly Dictionary<string, Hotkey> TokenMap = BuildTokenMap();
+
+        private static Dictionary<string, Hotkey> BuildTokenMap()
+        {
+            // 4 modifiers + F1..F24 + A..Z + 0..9, sized up front so the table never rehashes
+            var map = new Dictionary<string, Hotkey>(4 + 24 + 26 + 10, StringComparer.OrdinalIgnoreCase)
+            {
+                ["Ctrl"]  = new(Native.MOD_CONTROL, 0),
+                ["Alt"]   = new(Native.MOD_ALT, 0),
+                ["Shift"] = new(Native.MOD_SHIFT, 0),
+                ["Win"]   = new(Native.MOD_WIN, 0),
+            };
+            for (int n = 1; n <= 24; n++) map["F" + n] = new(0, (int)Keys.F1 + (n - 1));
+            for (char ch = 'A'; ch <= 'Z'; ch++) map[ch.ToString()] = new(0, ch); // VK for 'A'..'Z'
+            for (char ch = '0'; ch <= '9'; ch++) map[ch.ToString()] = new(0, ch); // VK for '0'..'9'
+            return map;
+        }
+
         // "Ctrl+Alt+F1" / "Ctrl+Shift+D" / "Win+Space" / "Alt+NumPad0"
-        private static void ParseHotkey(string s, out int mod, out int vk)
+        private static Hotkey ParseHotkey(string s)
         {
-            mod = 0; vk = 0;
+            int mod = 0, vk = 0;
 
             foreach (var raw in s.Split('+'))
             {
                 string p = raw.Trim();
-                if (p.Equals("Ctrl", StringComparison.OrdinalIgnoreCase)) { mod |= Native.MOD_CONTROL; continue; }
-                if (p.Equals("Alt",  StringComparison.OrdinalIgnoreCase)) { mod |= Native.MOD_ALT;      continue; }
-                if (p.Equals("Shift",StringComparison.OrdinalIgnoreCase)) { mod |= Native.MOD_SHIFT;    continue; }
-                if (p.Equals("Win",  StringComparison.OrdinalIgnoreCase)) { mod |= Native.MOD_WIN;      continue; }
-
-                // try Keys enum
+                if (TokenMap.TryGetValue(p, out var t))
+                {
+                    mod |= t.Modifiers;
+                    if (t.Vk != 0) vk = t.Vk;
+                    continue;
+                }
+                // other Keys enum names (Space, Home, NumPad0, ...)
                 if (Enum.TryParse<Keys>(p, true, out var k) && k != Keys.None)
                 {
                     vk = (int)k;
                     continue;
                 }
-                // F1..F24
-                var f = System.Text.RegularExpressions.Regex.Match(p, @"^[Ff](\d{1,2})$");
-                if (f.Success && int.TryParse(f.Groups[1].Value, out int n) && n >= 1 && n <= 24)
+                throw new ArgumentException($"未知键：{p}");
+            }
+            if (vk == 0) throw new ArgumentException("未指定主键（如 F1）");
+            return new Hotkey(mod, vk);
+        }
+    }
+
+    // ---------- Raw mouse input for desktop double-click ----------
+    // WM_INPUT with RIDEV_INPUTSINK replaces a global WH_MOUSE_LL hook: nothing is injected
+    // into other processes' input path, so high polling-rate mice are unaffected.
+    // The sink window lives on its own thread with its own message loop, so the WM_INPUT
+    // stream never competes with the UI (menus, message boxes); only primary-button presses
+    // are posted to the UI thread as WM_APP_RAWCLICK.
+    private sealed class RawMouseSink : NativeWindow, IDisposable
+    {
+        private const int WM_APP_START = Native.WM_APP + 2;
+        private const int WM_APP_STOP  = Native.WM_APP + 3;
+
+        // requested state, owned by the UI thread
+        public bool Active { get; private set; }
+        // registration result, written by the sink thread
+        public bool Registered => _registered;
+
+        private static readonly int HeaderSize = Marshal.SizeOf<Native.RAWINPUTHEADER>();
+        private static readonly uint DeviceSize = (uint)Marshal.SizeOf<Native.RAWINPUTDEVICE>();
+        // GetRawInputBuffer hands WOW64 processes 64-bit records (8 extra header bytes, QWORD-aligned).
+        private static readonly int Wow64Pad   = Environment.Is64BitOperatingSystem && !Environment.Is64BitProcess ? 8 : 0;
+        private static readonly int BlockAlign = Environment.Is64BitOperatingSystem ? 8 : 4;
+
+        private readonly IntPtr _target; // receives WM_APP_RAWCLICK
+        private readonly Thread _thread;
+        private IntPtr _hwnd;
+
+        private volatile bool _registered;
+
+        // sink thread only
+        private IntPtr _buf = IntPtr.Zero;
+        private int _bufSize;
+        private ushort _downFlag = Native.RI_MOUSE_LEFT_BUTTON_DOWN;
+
+        public RawMouseSink(IntPtr target)
+        {
+            _target = target;
+            using var ready = new ManualResetEventSlim();
+            Exception? error = null;
+            _thread = new Thread(() =>
+            {
+                try
                 {
-                    vk = (int)Keys.F1 + (n - 1);
-                    continue;
+                    CreateHandle(new CreateParams { Parent = Native.HWND_MESSAGE });
+                    _hwnd = Handle;
                 }
-                // Single letter/digit
-                if (p.Length == 1)
+                catch (Exception ex)
                 {
-                    char ch = char.ToUpperInvariant(p[0]);
-                    vk = ch; // VK for 'A'..'Z' or '0'..'9'
-                    continue;
+                    error = ex;
+                    return;
                 }
-                throw new ArgumentException($"未知键：{p}");
+                finally
+                {
+                    ready.Set(); // never leave the UI thread waiting
+                }
+                Application.Run();
+            })
+            { IsBackground = true, Name = "RawMouseSink" };
+            _thread.Start();
+            ready.Wait();
+            if (error != null) throw new InvalidOperationException("创建原始输入窗口失败", error);
+        }
+
+        public void Start()
+        {
+            Active = true;
+            Native.PostMessage(_hwnd, WM_APP_START, IntPtr.Zero, IntPtr.Zero);
+        }
+
+        public void Stop()
+        {
+            Active = false;
+            Native.PostMessage(_hwnd, WM_APP_STOP, IntPtr.Zero, IntPtr.Zero);
+        }
+
+        public void Dispose()
+        {
+            Active = false;
+            if (Native.PostMessage(_hwnd, Native.WM_CLOSE, IntPtr.Zero, IntPtr.Zero))
+                _thread.Join(1000);
+        }
+
+        protected override void WndProc(ref Message m)
+        {
+            if (m.Msg == Native.WM_INPUT)
+            {
+                ReadRawInput(m.LParam);
+                DrainRawInputBuffer();
             }
-            if (vk == 0) throw new ArgumentException("未指定主键（如 F1）");
+            else if (m.Msg == WM_APP_START)
+            {
+                Register();
+                return;
+            }
+            else if (m.Msg == WM_APP_STOP)
+            {
+                Unregister();
+                return;
+            }
+            else if (m.Msg == Native.WM_CLOSE)
+            {
+                Unregister();
+                DestroyHandle();
+                FreeBuffer();
+                Application.ExitThread();
+                return;
+            }
+            base.WndProc(ref m);
+        }
+
+        private void Register()
+        {
+            if (_registered) return;
+            // raw input reports physical buttons; follow the user's primary button
+            _downFlag = SystemInformation.MouseButtonsSwapped ? Native.RI_MOUSE_RIGHT_BUTTON_DOWN : Native.RI_MOUSE_LEFT_BUTTON_DOWN;
+            var rid = new Native.RAWINPUTDEVICE
+            {
+                usUsagePage = 0x01, // generic desktop
+                usUsage = 0x02,     // mouse
+                dwFlags = Native.RIDEV_INPUTSINK,
+                hwndTarget = Handle
+            };
+            _registered = Native.RegisterRawInputDevices(ref rid, 1, DeviceSize);
+        }
+
+        private void Unregister()
+        {
+            if (!_registered) return;
+            var rid = new Native.RAWINPUTDEVICE
+            {
+                usUsagePage = 0x01,
+                usUsage = 0x02,
+                dwFlags = Native.RIDEV_REMOVE,
+                hwndTarget = IntPtr.Zero
+            };
+            Native.RegisterRawInputDevices(ref rid, 1, DeviceSize);
+            _registered = false;
+        }
+
+        private void ReadRawInput(IntPtr hRawInput)
+        {
+            uint size = 0;
+            Native.GetRawInputData(hRawInput, Native.RID_INPUT, IntPtr.Zero, ref size, (uint)HeaderSize);
+            if (size == 0) return;
+            EnsureBuffer((int)size);
+            if (Native.GetRawInputData(hRawInput, Native.RID_INPUT, _buf, ref size, (uint)HeaderSize) == uint.MaxValue) return;
+            HandleRecord(_buf, 0);
+        }
+
+        // Fetch whatever else is queued in one call instead of one WM_INPUT per event.
+        private void DrainRawInputBuffer()
+        {
+            uint size = 0;
+            if (Native.GetRawInputBuffer(IntPtr.Zero, ref size, (uint)HeaderSize) != 0 || size == 0) return;
+            EnsureBuffer((int)size * 16);
+
+            while (true)
+            {
+                uint cb = (uint)_bufSize;
+                uint n = Native.GetRawInputBuffer(_buf, ref cb, (uint)HeaderSize);
+                if (n == 0 || n == uint.MaxValue) break;
+
+                IntPtr p = _buf;
+                for (uint i = 0; i < n; i++)
+                {
+                    HandleRecord(p, Wow64Pad);
+                    int dwSize = Marshal.ReadInt32(p, 4); // RAWINPUTHEADER.dwSize
+                    long next = (p.ToInt64() + dwSize + BlockAlign - 1) & ~(long)(BlockAlign - 1);
+                    p = new IntPtr(next);
+                }
+            }
+        }
+
+        // Reads the two fields it needs straight from the unmanaged record; no marshalled copies.
+        private unsafe void HandleRecord(IntPtr p, int pad)
+        {
+            if (((Native.RAWINPUTHEADER*)p)->dwType != Native.RIM_TYPEMOUSE) return;
+            var mouse = (Native.RAWMOUSE*)(p + HeaderSize + pad);
+            if ((mouse->usButtonFlags & _downFlag) == 0) return;
+
+            if (!Native.GetCursorPos(out var pt)) return;
+            int xy = (pt.Y << 16) | (pt.X & 0xFFFF); // MAKELPARAM; screen coords fit in 16 bits
+            Native.PostMessage(_target, HiddenForm.WM_APP_RAWCLICK, (IntPtr)Environment.TickCount, (IntPtr)xy);
+        }
+
+        private void EnsureBuffer(int size)
+        {
+            if (size <= _bufSize) return;
+            FreeBuffer();
+            _buf = Marshal.AllocHGlobal(size);
+            _bufSize = size;
+        }
+
+        private void FreeBuffer()
+        {
+            if (_buf == IntPtr.Zero) return;
+            Marshal.FreeHGlobal(_buf);
+            _buf = IntPtr.Zero;
+            _bufSize = 0;
         }
     }
 
+    private readonly record struct RawClickInfo(Native.POINT Pt, int Tick);
+
     // ---------- Native P/Invoke ----------
-    private static class Native
+    private static partial class Native
     {
         public const int WM_HOTKEY = 0x0312;
         public const int WM_COMMAND = 0x0111;
+        public const int WM_SETTINGCHANGE = 0x001A;
+        public const int WM_DISPLAYCHANGE = 0x007E;
 
         public const int MOD_ALT = 0x0001;
         public const int MOD_CONTROL = 0x0002;
         public const int MOD_SHIFT = 0x0004;
         public const int MOD_WIN = 0x0008;
+        public const int MOD_NOREPEAT = 0x4000;
+
+        public const int WM_APP = 0x8000;
+        public const int WM_CLOSE = 0x0010;
+
+        public const int WM_INPUT = 0x00FF;
+        public const uint RID_INPUT = 0x10000003;
+        public const uint RIM_TYPEMOUSE = 0;
+        public const uint RIDEV_REMOVE = 0x00000001;
+        public const uint RIDEV_INPUTSINK = 0x00000100;
+        public const ushort RI_MOUSE_LEFT_BUTTON_DOWN = 0x0001;
+        public const ushort RI_MOUSE_RIGHT_BUTTON_DOWN = 0x0004;
+        public static readonly IntPtr HWND_MESSAGE = new(-3);
 
-        public const int WH_MOUSE_LL = 14;
-        public const int WM_LBUTTONDOWN = 0x0201;
+        public const uint GA_ROOT = 2;
+        public const uint MONITOR_DEFAULTTONEAREST = 2;
+        public const int GCW_ATOM = -32;
 
         public const int LVM_FIRST = 0x1000;
         public const int LVM_HITTEST = LVM_FIRST + 18;
@@ -585,7 +957,43 @@ internal static class App
         }
 
         [StructLayout(LayoutKind.Sequential)]
-        public struct RECT { public int Left, Top, Right, Bottom; }
+        public struct RAWINPUTDEVICE
+        {
+            public ushort usUsagePage;
+            public ushort usUsage;
+            public uint dwFlags;
+            public IntPtr hwndTarget;
+        }
+
+        [StructLayout(LayoutKind.Sequential)]
+        public struct RAWINPUTHEADER
+        {
+            public uint dwType;
+            public uint dwSize;
+            public IntPtr hDevice;
+            public IntPtr wParam;
+        }
+
+        [StructLayout(LayoutKind.Explicit)]
+        public struct RAWMOUSE
+        {
+            [FieldOffset(0)]  public ushort usFlags;
+            [FieldOffset(4)]  public ushort usButtonFlags;
+            [FieldOffset(6)]  public ushort usButtonData;
+            [FieldOffset(8)]  public uint ulRawButtons;
+            [FieldOffset(12)] public int lLastX;
+            [FieldOffset(16)] public int lLastY;
+            [FieldOffset(20)] public uint ulExtraInformation;
+        }
+
+        [StructLayout(LayoutKind.Sequential)]
+        public struct RECT
+        {
+            public int Left, Top, Right, Bottom;
+            public readonly int Width => Right - Left;
+            public readonly int Height => Bottom - Top;
+            public readonly bool Contains(POINT pt) => pt.X >= Left && pt.X < Right && pt.Y >= Top && pt.Y < Bottom;
+        }
 
         [StructLayout(LayoutKind.Sequential, CharSet = CharSet.Unicode)]
         public struct MONITORINFO
@@ -595,46 +1003,50 @@ internal static class App
             public RECT rcWork;
             public int dwFlags;
         }
-
-        public delegate IntPtr LowLevelMouseProc(int nCode, IntPtr wParam, IntPtr lParam);
-
-        [DllImport("user32.dll")] public static extern bool RegisterHotKey(IntPtr hWnd, int id, int fsModifiers, int vk);
-        [DllImport("user32.dll")] public static extern bool UnregisterHotKey(IntPtr hWnd, int id);
-
-        [DllImport("user32.dll", SetLastError = true)] public static extern IntPtr SetWindowsHookEx(int idHook, LowLevelMouseProc lpfn, IntPtr hMod, uint dwThreadId);
-        [DllImport("user32.dll", SetLastError = true)] public static extern bool UnhookWindowsHookEx(IntPtr hhk);
-        [DllImport("user32.dll")] public static extern IntPtr CallNextHookEx(IntPtr hhk, int nCode, IntPtr wParam, IntPtr lParam);
-
-        [DllImport("user32.dll")] public static extern bool GetCursorPos(out POINT lpPoint);
-        [DllImport("user32.dll")] public static extern IntPtr WindowFromPoint(POINT Point);
-        [DllImport("user32.dll", CharSet = CharSet.Unicode)] public static extern int GetClassName(IntPtr hWnd, StringBuilder lpClassName, int nMax);
-        [DllImport("user32.dll")] public static extern IntPtr GetParent(IntPtr hWnd);
-        [DllImport("user32.dll", CharSet = CharSet.Unicode)] public static extern IntPtr FindWindow(string? lpClassName, string? lpWindowName);
-        [DllImport("user32.dll", CharSet = CharSet.Unicode)] public static extern IntPtr FindWindowEx(IntPtr hwndParent, IntPtr hwndChildAfter, string? lpszClass, string? lpszWindow);
-        [DllImport("user32.dll", CharSet = CharSet.Unicode)] public static extern IntPtr SendMessage(IntPtr hWnd, int Msg, IntPtr wParam, IntPtr lParam);
-        [DllImport("user32.dll", CharSet = CharSet.Unicode)] public static extern IntPtr SendMessage(IntPtr hWnd, int Msg, IntPtr wParam, ref LVHITTESTINFO lParam);
-        [DllImport("user32.dll")] public static extern bool ScreenToClient(IntPtr hWnd, ref POINT lpPoint);
-
-        [DllImport("user32.dll")] public static extern IntPtr GetForegroundWindow();
-        [DllImport("user32.dll")] public static extern bool GetWindowRect(IntPtr hWnd, out RECT lpRect);
-        [DllImport("user32.dll")] public static extern IntPtr MonitorFromWindow(IntPtr hwnd, uint dwFlags);
-        [DllImport("user32.dll", CharSet = CharSet.Unicode)] public static extern bool GetMonitorInfo(IntPtr hMonitor, ref MONITORINFO lpmi);
-
-        [DllImport("user32.dll", CharSet = CharSet.Unicode)] public static extern uint RegisterWindowMessage(string lpString);
+        public static readonly int MonitorInfoSize = Marshal.SizeOf<MONITORINFO>();
+
+        // Source-generated stubs (LibraryImport): marshalling is fixed at compile time, no runtime IL stub generation.
+        [LibraryImport("user32.dll")] [return: MarshalAs(UnmanagedType.Bool)] public static partial bool RegisterHotKey(IntPtr hWnd, int id, int fsModifiers, int vk);
+        [LibraryImport("user32.dll")] [return: MarshalAs(UnmanagedType.Bool)] public static partial bool UnregisterHotKey(IntPtr hWnd, int id);
+
+        [LibraryImport("user32.dll")] [return: MarshalAs(UnmanagedType.Bool)] public static partial bool RegisterRawInputDevices(ref RAWINPUTDEVICE pRawInputDevices, uint uiNumDevices, uint cbSize);
+        [LibraryImport("user32.dll")] public static partial uint GetRawInputData(IntPtr hRawInput, uint uiCommand, IntPtr pData, ref uint pcbSize, uint cbSizeHeader);
+        [LibraryImport("user32.dll")] public static partial uint GetRawInputBuffer(IntPtr pData, ref uint pcbSize, uint cbSizeHeader);
+
+        [LibraryImport("user32.dll")] [return: MarshalAs(UnmanagedType.Bool)] public static partial bool GetCursorPos(out POINT lpPoint);
+        [LibraryImport("user32.dll")] public static partial IntPtr WindowFromPoint(POINT Point);
+        [LibraryImport("user32.dll", EntryPoint = "GetClassNameW")] public static unsafe partial int GetClassName(IntPtr hWnd, char* lpClassName, int nMaxCount);
+        [LibraryImport("user32.dll")] public static partial IntPtr GetParent(IntPtr hWnd);
+        [LibraryImport("user32.dll")] public static partial ushort GetClassWord(IntPtr hWnd, int nIndex);
+        [LibraryImport("user32.dll")] public static partial IntPtr GetAncestor(IntPtr hWnd, uint gaFlags);
+        [LibraryImport("user32.dll")] [return: MarshalAs(UnmanagedType.Bool)] public static partial bool IsWindow(IntPtr hWnd);
+        [LibraryImport("user32.dll", EntryPoint = "FindWindowW", StringMarshalling = StringMarshalling.Utf16)] public static partial IntPtr FindWindow(string? lpClassName, string? lpWindowName);
+        [LibraryImport("user32.dll", EntryPoint = "FindWindowExW", StringMarshalling = StringMarshalling.Utf16)] public static partial IntPtr FindWindowEx(IntPtr hwndParent, IntPtr hwndChildAfter, string? lpszClass, string? lpszWindow);
+        [LibraryImport("user32.dll", EntryPoint = "SendMessageW")] public static partial IntPtr SendMessage(IntPtr hWnd, int Msg, IntPtr wParam, IntPtr lParam);
+        [LibraryImport("user32.dll", EntryPoint = "SendMessageW")] public static partial IntPtr SendMessage(IntPtr hWnd, int Msg, IntPtr wParam, ref LVHITTESTINFO lParam);
+        [LibraryImport("user32.dll", EntryPoint = "PostMessageW")] [return: MarshalAs(UnmanagedType.Bool)] public static partial bool PostMessage(IntPtr hWnd, int Msg, IntPtr wParam, IntPtr lParam);
+        [LibraryImport("user32.dll")] [return: MarshalAs(UnmanagedType.Bool)] public static partial bool ScreenToClient(IntPtr hWnd, ref POINT lpPoint);
+
+        [LibraryImport("user32.dll")] public static partial IntPtr GetForegroundWindow();
+        [LibraryImport("user32.dll")] [return: MarshalAs(UnmanagedType.Bool)] public static partial bool GetWindowRect(IntPtr hWnd, out RECT lpRect);
+        [LibraryImport("user32.dll")] public static partial IntPtr MonitorFromWindow(IntPtr hwnd, uint dwFlags);
+        [LibraryImport("user32.dll", EntryPoint = "GetMonitorInfoW")] [return: MarshalAs(UnmanagedType.Bool)] public static partial bool GetMonitorInfo(IntPtr hMonitor, ref MONITORINFO lpmi);
+
+        [LibraryImport("user32.dll", EntryPoint = "RegisterWindowMessageW", StringMarshalling = StringMarshalling.Utf16)] public static partial uint RegisterWindowMessage(string lpString);
     }
 
     // ---------- Helpers ----------
-    private static uint RegisterWindowMessage(string name) => Native.RegisterWindowMessage(name);
-
-    [DllImport("user32.dll", CharSet = CharSet.Unicode)]
-    private static extern IntPtr SendMessage(IntPtr hWnd, uint Msg, IntPtr wParam, IntPtr lParam);
+    // Registered message IDs are fixed for the session, so each name is registered once.
+    private static readonly Dictionary<string, uint> RegisteredMessages = new(StringComparer.Ordinal);
 
-    [DllImport("user32.dll", CharSet = CharSet.Unicode)]
-    private static extern IntPtr FindWindow(string? lpClassName, string? lpWindowName);
-
-    private static class NativeExt
+    private static uint RegisterWindowMessage(string name)
     {
-        public const uint MONITOR_DEFAULTTONEAREST = 2;
+        if (!RegisteredMessages.TryGetValue(name, out uint id))
+        {
+            id = Native.RegisterWindowMessage(name);
+            if (id != 0) RegisteredMessages[name] = id;
+        }
+        return id;
     }
 
     internal static bool IsFullscreenForeground()
@@ -643,16 +1055,11 @@ internal static class App
         if (fg == IntPtr.Zero) return false;
         if (!Native.GetWindowRect(fg, out var r)) return false;
 
-        IntPtr mon = Native.MonitorFromWindow(fg, NativeExt.MONITOR_DEFAULTTONEAREST);
-        var mi = new Native.MONITORINFO { cbSize = Marshal.SizeOf<Native.MONITORINFO>() };
+        IntPtr mon = Native.MonitorFromWindow(fg, Native.MONITOR_DEFAULTTONEAREST);
+        var mi = new Native.MONITORINFO { cbSize = Native.MonitorInfoSize };
         if (!Native.GetMonitorInfo(mon, ref mi)) return false;
 
-        int w = r.Right - r.Left;
-        int h = r.Bottom - r.Top;
-        int mw = mi.rcMonitor.Right - mi.rcMonitor.Left;
-        int mh = mi.rcMonitor.Bottom - mi.rcMonitor.Top;
-
         // Allow 3px tolerance to reduce false negatives in borderless / scaling scenarios.
-        return Math.Abs(w - mw) <= 3 && Math.Abs(h - mh) <= 3;
+        return Math.Abs(r.Width - mi.rcMonitor.Width) <= 3 && Math.Abs(r.Height - mi.rcMonitor.Height) <= 3;
     }
 }